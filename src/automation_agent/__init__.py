@@ -1,11 +1,17 @@
 """Automation agent package."""
-from .action_executor import ActionExecutor, Planner, RuleBasedPlanner
-from .browser_controller import BrowserController, HTTPError
+from .action_executor import ActionExecutor, AsyncActionExecutor, Planner, RuleBasedPlanner
+from .browser_controller import AsyncBrowserController, BrowserController, HTTPError, get_shared_controller
+from .cdp import CDPConnection, CDPError
 
 __all__ = [
     "ActionExecutor",
+    "AsyncActionExecutor",
     "Planner",
     "RuleBasedPlanner",
+    "AsyncBrowserController",
     "BrowserController",
+    "CDPConnection",
+    "CDPError",
     "HTTPError",
+    "get_shared_controller",
 ]
@@ -0,0 +1,11 @@
+"""Helpers that paper over differences between supported Python versions."""
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict
+
+# Slotted dataclasses must stay weak-referenceable, and
+# ``dataclass(weakref_slot=True)`` is only available on Python 3.11+.
+DATACLASS_SLOTS: Dict[str, Any] = {"slots": True, "weakref_slot": True} if sys.version_info >= (3, 11) else {}
+
+__all__ = ["DATACLASS_SLOTS"]
@@ -0,0 +1,33 @@
+"""JSON helpers that use :mod:`orjson` when it is installed.
+
+Both helpers work on UTF-8 ``bytes`` so callers never decode or encode
+payloads themselves.  The standard library fallback produces the same compact
+output as ``orjson``.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:  # pragma: no cover - depends on the optional "fast" extra
+    import orjson
+except ImportError:  # pragma: no cover - depends on the optional "fast" extra
+    orjson = None
+
+
+if orjson is not None:
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+else:
+
+    def loads(data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+__all__ = ["dumps", "loads"]
@@ -0,0 +1,28 @@
+"""Process spawning helpers shared by the browser controller and native bridge."""
+from __future__ import annotations
+
+import os
+import shutil
+from typing import List, Mapping, Optional, Sequence
+
+
+def resolve_executable(args: Sequence[str], env: Optional[Mapping[str, str]] = None) -> List[str]:
+    """Returns ``args`` with a bare executable name resolved against ``PATH``.
+
+    CPython only uses its ``posix_spawn`` fast path when the executable has a
+    directory component and ``close_fds=False``.  Descriptors created by
+    Python are non-inheritable by default, but ``close_fds=False`` still
+    hands the child any descriptor explicitly marked inheritable or opened
+    without ``O_CLOEXEC`` by native code, so callers must opt into it
+    deliberately.  Names that cannot be resolved are left untouched so the
+    usual ``FileNotFoundError`` is raised when spawning.
+    """
+
+    executable = args[0]
+    if not os.path.dirname(executable):
+        search_path = (env if env is not None else os.environ).get("PATH")
+        executable = shutil.which(executable, path=search_path) or executable
+    return [executable, *args[1:]]
+
+
+__all__ = ["resolve_executable"]
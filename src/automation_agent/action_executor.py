@@ -1,10 +1,14 @@
 """Planning layer that transforms natural language into browser actions."""
 from __future__ import annotations
 
+import functools
+import re
+import urllib.parse
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Protocol
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
 
-from .browser_controller import BrowserController
+from ._compat import DATACLASS_SLOTS
+from .browser_controller import AsyncBrowserController, BrowserController
 
 
 class Planner(Protocol):
@@ -14,29 +18,82 @@ class Planner(Protocol):
         ...
 
 
-@dataclass
+# ``open <target>`` takes precedence over ``... search for <query>``.
+_REQUEST_PATTERN = re.compile(
+    r"^(?:\s*open\s+(?P<target>\S(?:.*\S)?)|.*?search for\s+(?P<query>\S(?:.*\S)?))\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _split_search_template(template: str) -> Optional[Tuple[str, str]]:
+    prefix, placeholder, suffix = template.partition("{query}")
+    # Templates with escaped braces or without a single placeholder keep
+    # going through str.format so their semantics are unchanged.
+    if placeholder and "{" not in prefix + suffix and "}" not in prefix + suffix:
+        return prefix, suffix
+    return None
+
+
+def _search_url(template: str, query: str) -> str:
+    encoded = urllib.parse.quote_plus(query)
+    parts = _split_search_template(template)
+    if parts is None:
+        return template.format(query=encoded)
+    return parts[0] + encoded + parts[1]
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_plan(search_engine: str, request: str) -> Tuple[Tuple[Tuple[str, Any], ...], ...]:
+    match = _REQUEST_PATTERN.match(request)
+    if match is None:
+        url = _search_url(search_engine, request)
+    elif match.group("target") is not None:
+        target = match.group("target")
+        url = target if target.startswith("http") else _search_url(search_engine, target)
+    else:
+        url = _search_url(search_engine, match.group("query"))
+    return ((("type", "open_url"), ("url", url)),)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class RuleBasedPlanner:
     """Very small heuristic planner used as a deterministic baseline.
 
     The class is intentionally simplistic so it can run in offline test
     environments.  Projects can replace it with an LLM-backed implementation by
     providing an object that implements :class:`Planner`.
+
+    Planning is pure, so results for recently seen requests are cached.  Each
+    call still returns fresh dictionaries that callers may mutate.
     """
 
     default_search_engine: str = "https://www.google.com/search?q={query}"
 
     def plan(self, request: str) -> List[Dict[str, Any]]:
-        lowered = request.lower().strip()
-        if lowered.startswith("open "):
-            url = request[5:].strip()
-            if not url.startswith("http"):
-                url = self.default_search_engine.format(query=url.replace(" ", "+"))
-            return [{"type": "open_url", "url": url}]
-        if "search for" in lowered:
-            query = request.split("search for", 1)[1].strip()
-            url = self.default_search_engine.format(query=query.replace(" ", "+"))
-            return [{"type": "open_url", "url": url}]
-        return [{"type": "open_url", "url": self.default_search_engine.format(query=request.replace(" ", "+"))}]
+        return [dict(action) for action in _cached_plan(self.default_search_engine, request)]
+
+    def plan_many(self, requests: Iterable[str]) -> List[List[Dict[str, Any]]]:
+        """Plans a batch of requests in one pass, preserving input order."""
+
+        search_engine = self.default_search_engine
+        return [[dict(action) for action in _cached_plan(search_engine, request)] for request in requests]
+
+
+def _plan_many(planner: Planner, requests: Iterable[str]) -> List[List[Dict[str, Any]]]:
+    plan_many = getattr(planner, "plan_many", None)
+    if plan_many is not None:
+        return plan_many(requests)
+    return [planner.plan(request) for request in requests]
+
+
+def _split_results(plans: List[List[Dict[str, Any]]], results: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    grouped = []
+    start = 0
+    for plan in plans:
+        grouped.append(results[start : start + len(plan)])
+        start += len(plan)
+    return grouped
 
 
 class ActionExecutor:
@@ -52,14 +109,59 @@ class ActionExecutor:
             return plan
         return self.browser_controller.perform_actions(plan)
 
-    def stream_execution(self, request: str, *, dry_run: bool = False) -> Iterable[Dict[str, Any]]:
+    def execute_many(self, requests: Iterable[str], *, dry_run: bool = False) -> List[List[Dict[str, Any]]]:
+        """Plans and executes several requests, returning one result list per request.
+
+        The actions of every request are sent to the browser as a single batch,
+        so a failing action does not stop later requests; see
+        :meth:`BrowserController.perform_actions` for how failures are reported.
+        """
+
+        plans = _plan_many(self.planner, requests)
+        if dry_run:
+            return plans
+        results = self.browser_controller.perform_actions([action for plan in plans for action in plan])
+        return _split_results(plans, results)
+
+    def stream_execution(self, request: str, *, dry_run: bool = False) -> Iterator[Dict[str, Any]]:
+        plan = self.planner.plan(request)
+        if dry_run:
+            return iter(plan)
+        return self._stream_actions(plan)
+
+    def _stream_actions(self, plan: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for action in plan:
+            yield self.browser_controller.execute_action(action)
+
+
+class AsyncActionExecutor:
+    """Coordinates planning and browser control on an :mod:`asyncio` loop."""
+
+    def __init__(self, browser_controller: AsyncBrowserController, planner: Planner | None = None) -> None:
+        self.browser_controller = browser_controller
+        self.planner = planner or RuleBasedPlanner()
+
+    async def execute(self, request: str, *, dry_run: bool = False) -> List[Dict[str, Any]]:
+        plan = self.planner.plan(request)
+        if dry_run:
+            return plan
+        return await self.browser_controller.perform_actions(plan)
+
+    async def execute_many(self, requests: Iterable[str], *, dry_run: bool = False) -> List[List[Dict[str, Any]]]:
+        plans = _plan_many(self.planner, requests)
+        if dry_run:
+            return plans
+        results = await self.browser_controller.perform_actions([action for plan in plans for action in plan])
+        return _split_results(plans, results)
+
+    async def stream_execution(self, request: str, *, dry_run: bool = False) -> AsyncIterator[Dict[str, Any]]:
         plan = self.planner.plan(request)
         if dry_run:
             for action in plan:
                 yield action
             return
         for action in plan:
-            yield self.browser_controller.execute_action(action)
+            yield await self.browser_controller.execute_action(action)
 
 
-__all__ = ["ActionExecutor", "RuleBasedPlanner", "Planner"]
+__all__ = ["ActionExecutor", "AsyncActionExecutor", "RuleBasedPlanner", "Planner"]
@@ -7,20 +7,51 @@ that network and process interactions can be stubbed in tests.
 """
 from __future__ import annotations
 
-import json
+import asyncio
+import http.client
+import ipaddress
+import queue
+import socket
 import subprocess
+import threading
 import time
 import urllib.parse
-import urllib.request
+import weakref
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import _json
+from ._compat import DATACLASS_SLOTS
+from ._process import resolve_executable
+from .cdp import CDPConnection
 
 
 class HTTPError(RuntimeError):
     """Raised when the DevTools HTTP endpoint returns an unexpected response."""
 
 
-@dataclass
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _spawn_process(args: List[str]) -> subprocess.Popen:
+    """Starts ``args`` so CPython can use its ``posix_spawn`` fast path.
+
+    ``close_fds=False`` means the browser inherits any descriptor this process
+    has marked inheritable.  That is accepted here because the executable is
+    the configured browser rather than an instruction-driven command; callers
+    holding inheritable descriptors should pass their own ``process_factory``.
+    """
+
+    return subprocess.Popen(resolve_executable(args), close_fds=False)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class _ProcessHandle:
     popen: subprocess.Popen
 
@@ -28,6 +59,10 @@ class _ProcessHandle:
         if self.popen.poll() is None:
             self.popen.terminate()
 
+    def kill(self) -> None:
+        if self.popen.poll() is None:
+            self.popen.kill()
+
     def wait(self, timeout: Optional[float] = None) -> Optional[int]:
         try:
             return self.popen.wait(timeout=timeout)
@@ -39,20 +74,119 @@ class _ProcessHandle:
 
 
 class _DefaultHTTPClient:
-    """Small wrapper around :mod:`urllib` so the implementation can be mocked."""
+    """Small wrapper around :mod:`http.client` so the implementation can be mocked.
+
+    Connections are kept alive and pooled per ``host:port`` so repeated
+    DevTools calls reuse the same socket instead of paying a TCP handshake for
+    every request.  At most ``maxsize`` idle connections are retained per pool;
+    the pool is safe to share between threads.
+    """
+
+    # Errors raised when a pooled keep-alive connection was closed by the peer
+    # while it sat idle.  Such requests are retried once on a fresh socket.
+    _STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+    __slots__ = ("timeout", "maxsize", "_pools")
+
+    def __init__(self, timeout: float = 5.0, maxsize: int = 8) -> None:
+        self.timeout = timeout
+        self.maxsize = maxsize
+        self._pools: Dict[Tuple[str, int], "queue.LifoQueue[http.client.HTTPConnection]"] = {}
 
     def request(self, url: str, *, data: Optional[bytes] = None, method: str = "GET") -> bytes:
-        req = urllib.request.Request(url, data=data, method=method)
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        key = (parts.hostname or "localhost", parts.port or 80)
         try:
-            with urllib.request.urlopen(req, timeout=5) as response:
-                return response.read()
-        except Exception as exc:  # pragma: no cover - urllib generates varying errors
+            return self._send(key, method, path, data)
+        except HTTPError:
+            raise
+        except Exception as exc:  # pragma: no cover - socket errors vary by platform
             raise HTTPError(f"DevTools endpoint request failed for {url}: {exc}") from exc
 
+    def close(self) -> None:
+        """Closes every pooled connection."""
+
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+    def _send(self, key: Tuple[str, int], method: str, path: str, data: Optional[bytes]) -> bytes:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools.setdefault(key, queue.LifoQueue(maxsize=self.maxsize))
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect(key)
+            response, body = self._roundtrip(conn, method, path, data)
+        else:
+            try:
+                response, body = self._roundtrip(conn, method, path, data)
+            except self._STALE_CONNECTION_ERRORS:
+                conn = self._connect(key)
+                response, body = self._roundtrip(conn, method, path, data)
+
+        if response.will_close:
+            conn.close()
+        else:
+            try:
+                pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+        if response.status >= 400:
+            raise HTTPError(f"DevTools endpoint {path} returned HTTP {response.status}: {body[:200]!r}")
+        return body
+
+    def _connect(self, key: Tuple[str, int]) -> http.client.HTTPConnection:
+        return http.client.HTTPConnection(key[0], key[1], timeout=self.timeout)
+
+    @staticmethod
+    def _roundtrip(
+        conn: http.client.HTTPConnection, method: str, path: str, data: Optional[bytes]
+    ) -> Tuple[http.client.HTTPResponse, bytes]:
+        try:
+            conn.request(method, path, body=data)
+            response = conn.getresponse()
+            return response, response.read()
+        except Exception:
+            conn.close()
+            raise
+
 
 class BrowserController:
     """Launches a Chromium browser and executes DevTools commands."""
 
+    # action type -> (DevTools method, required action key, DevTools parameter)
+    _ACTION_COMMANDS: Dict[str, Tuple[str, str, str]] = {
+        "open_url": ("Target.createTarget", "url", "url"),
+        "activate": ("Target.activateTarget", "target_id", "targetId"),
+        "close": ("Target.closeTarget", "target_id", "targetId"),
+    }
+
+    __slots__ = (
+        "chrome_path",
+        "remote_debugging_port",
+        "host",
+        "startup_timeout",
+        "_http",
+        "_process_factory",
+        "_websocket_factory",
+        "_process",
+        "_ws",
+        "_ws_lock",
+        "_lifecycle_lock",
+        "_http_lock",
+        "_version_info",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         chrome_path: str = "google-chrome",
@@ -61,14 +195,37 @@ class BrowserController:
         startup_timeout: float = 15.0,
         http_client: Optional[_DefaultHTTPClient] = None,
         process_factory: Optional[Callable[[List[str]], subprocess.Popen]] = None,
+        websocket_factory: Optional[Callable[[str], CDPConnection]] = None,
     ) -> None:
         self.chrome_path = chrome_path
         self.remote_debugging_port = remote_debugging_port
         self.host = host
         self.startup_timeout = startup_timeout
-        self._http_client = http_client or _DefaultHTTPClient()
-        self._process_factory = process_factory or subprocess.Popen
+        self._http = http_client
+        self._process_factory = process_factory or _spawn_process
+        self._websocket_factory = websocket_factory or CDPConnection
         self._process: Optional[_ProcessHandle] = None
+        self._ws: Optional[CDPConnection] = None
+        self._version_info: Optional[Dict[str, Any]] = None
+        self._ws_lock = threading.Lock()
+        # Guards launching/terminating the browser; never taken while holding
+        # _ws_lock.  _http_lock only guards creating the default HTTP client.
+        self._lifecycle_lock = threading.RLock()
+        self._http_lock = threading.Lock()
+
+    @property
+    def _http_client(self) -> _DefaultHTTPClient:
+        """HTTP client for the DevTools endpoints, created on first use.
+
+        Commands such as ``plan`` never talk to the browser and therefore never
+        pay for the client or its connection pool.
+        """
+
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    self._http = _DefaultHTTPClient()
+        return self._http
 
     # ------------------------------------------------------------------
     # Process lifecycle helpers
@@ -81,53 +238,66 @@ class BrowserController:
         reachable.
         """
 
-        if self._process and self._process.is_running():
-            return
-
-        args = [
-            self.chrome_path,
-            f"--remote-debugging-port={self.remote_debugging_port}",
-            "--remote-allow-origins=*",
-        ]
-        if headless:
-            args.append("--headless=new")
-        if user_data_dir:
-            args.append(f"--user-data-dir={user_data_dir}")
-        if additional_args:
-            args.extend(additional_args)
-
-        popen = self._process_factory(args)
-        self._process = _ProcessHandle(popen=popen)
-        self._wait_until_ready()
+        with self._lifecycle_lock:
+            if self._process and self._process.is_running():
+                return
+
+            args = [
+                self.chrome_path,
+                f"--remote-debugging-port={self.remote_debugging_port}",
+                "--remote-allow-origins=*",
+            ]
+            if headless:
+                args.append("--headless=new")
+            if user_data_dir:
+                args.append(f"--user-data-dir={user_data_dir}")
+            if additional_args:
+                args.extend(additional_args)
+
+            popen = self._process_factory(args)
+            self._process = _ProcessHandle(popen=popen)
+            _pin_shared_controller(self)
+            self._wait_until_ready()
 
     def is_browser_running(self) -> bool:
         return bool(self._process and self._process.is_running())
 
     def terminate_browser(self) -> None:
-        if self._process:
-            self._process.terminate()
-            self._process.wait(timeout=5)
-            self._process = None
+        """Stops the browser, escalating to SIGKILL if it ignores SIGTERM.
+
+        A healthy browser exits well within the 0.5s grace period, so a hung
+        process delays shutdown by at most about 1.5 seconds.
+        """
+
+        with self._lifecycle_lock:
+            if self._process:
+                self._process.terminate()
+                if self._process.wait(timeout=0.5) is None:
+                    self._process.kill()
+                    self._process.wait(timeout=1)
+                self._process = None
+            _unpin_shared_controller(self)
+            self._version_info = None
+            self._close_websocket()
+            close = getattr(self._http, "close", None)
+            if close is not None:
+                close()
 
     # ------------------------------------------------------------------
     # DevTools helpers
     # ------------------------------------------------------------------
     def list_tabs(self) -> List[Dict[str, Any]]:
         payload = self._request("/json/list")
-        return json.loads(payload.decode("utf-8"))
+        return _json.loads(payload)
 
     def open_tab(self, url: str) -> Dict[str, Any]:
-        query = urllib.parse.urlencode({"url": url})
-        payload = self._request(f"/json/new?{query}")
-        return json.loads(payload.decode("utf-8"))
+        return self._cdp_send("Target.createTarget", {"url": url})
 
     def close_tab(self, target_id: str) -> Dict[str, Any]:
-        payload = self._request(f"/json/close/{target_id}")
-        return json.loads(payload.decode("utf-8"))
+        return self._cdp_send("Target.closeTarget", {"targetId": target_id})
 
     def activate_tab(self, target_id: str) -> Dict[str, Any]:
-        payload = self._request(f"/json/activate/{target_id}")
-        return json.loads(payload.decode("utf-8"))
+        return self._cdp_send("Target.activateTarget", {"targetId": target_id})
 
     def execute_action(self, action: Dict[str, Any]) -> Dict[str, Any]:
         """Executes a high-level action.
@@ -138,50 +308,215 @@ class BrowserController:
         - ``close``: closes an existing tab.
         """
 
-        action_type = action.get("type")
-        if action_type == "open_url":
-            url = action.get("url")
-            if not url:
-                raise ValueError("open_url action requires a 'url'")
-            return self.open_tab(url)
-        if action_type == "activate":
-            target_id = action.get("target_id")
-            if not target_id:
-                raise ValueError("activate action requires a 'target_id'")
-            return self.activate_tab(target_id)
-        if action_type == "close":
-            target_id = action.get("target_id")
-            if not target_id:
-                raise ValueError("close action requires a 'target_id'")
-            return self.close_tab(target_id)
-        raise ValueError(f"Unsupported action type: {action_type}")
+        return self._cdp_send(*self._action_command(action))
 
     def perform_actions(self, actions: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        results = []
-        for action in actions:
-            results.append(self.execute_action(action))
-        return results
+        """Executes ``actions`` as one pipelined DevTools batch.
+
+        All actions are validated before anything is sent.  Commands are then
+        written back-to-back on the WebSocket and results are returned in input
+        order once every response has arrived.
+
+        A failing action does not stop the ones after it: they still run in the
+        browser.  The :class:`~automation_agent.cdp.CDPError` raised afterwards
+        exposes every action's outcome through its ``results`` and ``errors``
+        attributes.
+        """
+
+        commands = [self._action_command(action) for action in actions]
+        if not commands:
+            return []
+        return self._websocket().send_many(commands)
 
     # ------------------------------------------------------------------
     # Internal utilities
     # ------------------------------------------------------------------
     def _wait_until_ready(self) -> None:
-        """Polls the remote debugging endpoint until it responds or times out."""
+        """Polls the remote debugging port with exponential backoff until it responds or times out.
 
-        deadline = time.time() + self.startup_timeout
+        Each try is a bare TCP connect; only once the port accepts connections
+        is ``/json/version`` requested to confirm DevTools is serving HTTP.  The
+        probe starts after 10ms and doubles up to 200ms between tries, so a
+        fast browser start is noticed almost immediately.  The version payload
+        is kept for the first WebSocket connection.
+        """
+
+        deadline = time.monotonic() + self.startup_timeout
+        delay = 0.01
         last_error: Optional[Exception] = None
-        while time.time() < deadline:
-            try:
-                self.list_tabs()
-                return
-            except Exception as exc:  # pragma: no cover - exercised implicitly
-                last_error = exc
-                time.sleep(0.5)
+        while True:
+            if self._port_accepting(self._probe_timeout(deadline)):
+                try:
+                    self._version_info = self._fetch_version()
+                    return
+                except Exception as exc:
+                    last_error = exc
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.2)
         raise TimeoutError("Browser did not become ready in time") from last_error
 
+    def _probe_timeout(self, deadline: float) -> float:
+        """Connect timeout for one readiness probe.
+
+        A loopback connect either succeeds or is refused almost instantly, so a
+        short timeout is enough.  Remote hosts may need a full round-trip and get
+        whatever is left of the startup budget instead.
+        """
+
+        if _is_loopback(self.host):
+            return 0.05
+        return max(deadline - time.monotonic(), 0.05)
+
+    def _port_accepting(self, timeout: float = 0.05) -> bool:
+        try:
+            with socket.create_connection((self.host, self.remote_debugging_port), timeout=timeout):
+                return True
+        except OSError:
+            return False
+
+    def _fetch_version(self) -> Dict[str, Any]:
+        payload = self._request("/json/version")
+        return _json.loads(payload)
+
     def _request(self, path: str) -> bytes:
         url = f"http://{self.host}:{self.remote_debugging_port}{path}"
         return self._http_client.request(url)
 
+    @classmethod
+    def _action_command(cls, action: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Translates a high-level action into a DevTools method and params."""
+
+        action_type = action.get("type")
+        spec = cls._ACTION_COMMANDS.get(action_type)
+        if spec is None:
+            raise ValueError(f"Unsupported action type: {action_type}")
+        method, key, param = spec
+        value = action.get(key)
+        if not value:
+            raise ValueError(f"{action_type} action requires a '{key}'")
+        return method, {param: value}
+
+    def _cdp_send(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self._websocket().send(method, params)
+
+    def _websocket(self) -> CDPConnection:
+        """Returns the browser-level DevTools WebSocket, connecting on first use."""
+
+        with self._ws_lock:
+            if self._ws is None or self._ws.closed:
+                if self._ws is not None:
+                    self._ws.close()
+                # Reuse the readiness probe's payload once; reconnects refetch
+                # in case the browser was restarted behind our back.
+                version, self._version_info = self._version_info or self._fetch_version(), None
+                url = version.get("webSocketDebuggerUrl")
+                if not url:
+                    raise HTTPError("DevTools /json/version did not report a webSocketDebuggerUrl")
+                self._ws = self._websocket_factory(url)
+            return self._ws
+
+    def _close_websocket(self) -> None:
+        with self._ws_lock:
+            ws, self._ws = self._ws, None
+        if ws is not None:
+            ws.close()
+
+
+_shared_controllers: "weakref.WeakValueDictionary[Tuple[str, int, str], BrowserController]" = weakref.WeakValueDictionary()
+# Shared controllers that launched a browser stay strongly referenced until
+# terminate_browser so dropping the last holder cannot orphan the process.
+_running_shared_controllers: Dict[Tuple[str, int, str], BrowserController] = {}
+_shared_controllers_lock = threading.Lock()
+
+
+def _shared_key(controller: BrowserController) -> Tuple[str, int, str]:
+    return (controller.chrome_path, controller.remote_debugging_port, controller.host)
+
+
+def _pin_shared_controller(controller: BrowserController) -> None:
+    key = _shared_key(controller)
+    with _shared_controllers_lock:
+        if _shared_controllers.get(key) is controller:
+            _running_shared_controllers[key] = controller
+
+
+def _unpin_shared_controller(controller: BrowserController) -> None:
+    key = _shared_key(controller)
+    with _shared_controllers_lock:
+        if _running_shared_controllers.get(key) is controller:
+            del _running_shared_controllers[key]
+
+
+def get_shared_controller(
+    chrome_path: str = "google-chrome", remote_debugging_port: int = 9222, host: str = "127.0.0.1"
+) -> BrowserController:
+    """Returns the process-wide controller for a browser binary and debugging port.
+
+    Callers asking for the same browser share one controller and with it the
+    browser process, the DevTools WebSocket and the HTTP connection pool.  The
+    controller is cached while something still references it or while the
+    browser it launched is running, so the process is never left without a
+    controller that can stop it.
+
+    Because the browser is shared, :meth:`BrowserController.launch_browser`
+    only starts it once, and :meth:`BrowserController.terminate_browser`
+    called by any holder stops it for every holder.
+    """
+
+    key = (chrome_path, remote_debugging_port, host)
+    with _shared_controllers_lock:
+        controller = _shared_controllers.get(key)
+        if controller is None:
+            controller = BrowserController(chrome_path=chrome_path, remote_debugging_port=remote_debugging_port, host=host)
+            _shared_controllers[key] = controller
+        return controller
+
+
+class AsyncBrowserController:
+    """:mod:`asyncio` facade over :class:`BrowserController`.
+
+    DevTools calls run in worker threads so they never block the event loop.
+    :meth:`perform_actions` pipelines the whole batch over the shared
+    WebSocket, so its actions overlap instead of paying their round-trips one
+    after another.
+    """
+
+    def __init__(self, controller: Optional[BrowserController] = None, **kwargs: Any) -> None:
+        if controller is not None and kwargs:
+            raise TypeError("Pass either an existing controller or constructor arguments, not both")
+        self.controller = controller or BrowserController(**kwargs)
+
+    async def launch_browser(self, **kwargs: Any) -> None:
+        await asyncio.to_thread(self.controller.launch_browser, **kwargs)
+
+    def is_browser_running(self) -> bool:
+        return self.controller.is_browser_running()
+
+    async def terminate_browser(self) -> None:
+        await asyncio.to_thread(self.controller.terminate_browser)
+
+    async def list_tabs(self) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.controller.list_tabs)
+
+    async def open_tab(self, url: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.controller.open_tab, url)
+
+    async def close_tab(self, target_id: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.controller.close_tab, target_id)
+
+    async def activate_tab(self, target_id: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.controller.activate_tab, target_id)
+
+    async def execute_action(self, action: Dict[str, Any]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.controller.execute_action, action)
+
+    async def perform_actions(self, actions: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Executes ``actions`` as one pipelined batch without blocking the loop."""
+
+        return await asyncio.to_thread(self.controller.perform_actions, list(actions))
+
 
-__all__ = ["BrowserController", "HTTPError"]
+__all__ = ["AsyncBrowserController", "BrowserController", "HTTPError", "get_shared_controller"]
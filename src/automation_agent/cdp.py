@@ -0,0 +1,252 @@
+"""Minimal Chrome DevTools Protocol client over a persistent WebSocket.
+
+Only the subset of RFC 6455 required to talk to a local DevTools endpoint is
+implemented: a client handshake, masked text frames, fragmented messages and
+ping/pong handling.  Keeping it on the standard library means the package
+continues to work without third-party dependencies.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import socket
+import threading
+import urllib.parse
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import _json
+
+_WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+_OPCODE_CONTINUATION = 0x0
+_OPCODE_TEXT = 0x1
+_OPCODE_CLOSE = 0x8
+_OPCODE_PING = 0x9
+_OPCODE_PONG = 0xA
+
+
+class CDPError(RuntimeError):
+    """Raised when a DevTools command fails or the WebSocket is unusable.
+
+    When raised for a failed command in a batch, ``results`` holds one entry
+    per command in input order (``None`` for commands that failed) and
+    ``errors`` maps the index of each failed command to its DevTools error.
+    Both are empty for transport failures.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        results: Optional[List[Optional[Dict[str, Any]]]] = None,
+        errors: Optional[Dict[int, Any]] = None,
+    ) -> None:
+        super().__init__(message)
+        self.results = results if results is not None else []
+        self.errors = errors if errors is not None else {}
+
+
+def _apply_mask(payload: bytes, mask: bytes) -> bytes:
+    length = len(payload)
+    if not length:
+        return b""
+    key = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(length, "big")
+
+
+class CDPConnection:
+    """Sends DevTools commands over a single WebSocket connection.
+
+    Message ids increase monotonically and responses are matched by id, so
+    unsolicited events interleaved by the browser are skipped.  A lock
+    serialises commands which makes an instance safe to share between threads.
+    ``closed`` becomes true once the socket fails and the connection must be
+    replaced.
+    """
+
+    def __init__(self, url: str, *, timeout: float = 5.0) -> None:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != "ws" or not parts.hostname:
+            raise CDPError(f"Unsupported DevTools WebSocket URL: {url}")
+        self.url = url
+        self.closed = False
+        self._lock = threading.Lock()
+        self._next_id = 0
+        try:
+            self._sock = socket.create_connection((parts.hostname, parts.port or 80), timeout=timeout)
+        except OSError as exc:
+            raise CDPError(f"Could not connect to DevTools WebSocket {url}: {exc}") from exc
+        try:
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._reader = self._sock.makefile("rb")
+            self._handshake(parts)
+        except (OSError, CDPError) as exc:
+            self._sock.close()
+            raise CDPError(f"Could not connect to DevTools WebSocket {url}: {exc}") from exc
+
+    def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Sends ``method`` and blocks until its response arrives."""
+
+        return self.send_many([(method, params)])[0]
+
+    def send_many(self, commands: Sequence[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """Pipelines ``commands`` and returns their results in input order.
+
+        Every command is written before any response is read, so a batch costs
+        roughly one round-trip instead of one per command.  Responses are
+        demultiplexed by id as they arrive.
+
+        A failing command does not stop the commands after it, since they are
+        already on the wire.  Once every response has been consumed a
+        :class:`CDPError` naming the first failure is raised, carrying the
+        results and errors of the whole batch.
+        """
+
+        if not commands:
+            return []
+        with self._lock:
+            first_id = self._next_id + 1
+            self._next_id += len(commands)
+            frames = b"".join(
+                self._encode_frame(
+                    _OPCODE_TEXT,
+                    _json.dumps({"id": first_id + index, "method": method, "params": params or {}}),
+                )
+                for index, (method, params) in enumerate(commands)
+            )
+            responses: Dict[int, Dict[str, Any]] = {}
+            try:
+                self._sock.sendall(frames)
+                while len(responses) < len(commands):
+                    message = _json.loads(self._read_message())
+                    message_id = message.get("id")
+                    if isinstance(message_id, int) and first_id <= message_id < first_id + len(commands):
+                        responses[message_id] = message
+            except (OSError, CDPError) as exc:
+                self._abort()
+                raise CDPError(f"DevTools WebSocket failed during {commands[0][0]}: {exc}") from exc
+
+        results: List[Any] = []
+        errors: Dict[int, Any] = {}
+        for index in range(len(commands)):
+            message = responses[first_id + index]
+            if "error" in message:
+                errors[index] = message["error"]
+                results.append(None)
+            else:
+                results.append(message.get("result", {}))
+        if errors:
+            index = min(errors)
+            error = errors[index]
+            raise CDPError(
+                f"{commands[index][0]} failed: {error.get('message', error)}", results=results, errors=errors
+            )
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            try:
+                self._write_frame(_OPCODE_CLOSE, b"")
+            except OSError:
+                pass
+            self._abort()
+
+    def _abort(self) -> None:
+        """Releases the socket without a closing handshake; caller holds the lock."""
+
+        self.closed = True
+        self._reader.close()
+        self._sock.close()
+
+    # ------------------------------------------------------------------
+    # WebSocket framing
+    # ------------------------------------------------------------------
+    def _handshake(self, parts: urllib.parse.SplitResult) -> None:
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {parts.netloc}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            "\r\n"
+        )
+        self._sock.sendall(request.encode("ascii"))
+
+        status_line = self._reader.readline().decode("latin-1")
+        headers: Dict[str, str] = {}
+        while True:
+            line = self._reader.readline().decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if status_line.split(" ", 2)[1:2] != ["101"]:
+            raise CDPError(f"DevTools WebSocket handshake failed: {status_line.strip()!r}")
+        expected = base64.b64encode(hashlib.sha1((key + _WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        if headers.get("sec-websocket-accept") != expected:
+            raise CDPError("DevTools WebSocket handshake returned an invalid accept key")
+
+    def _write_frame(self, opcode: int, payload: bytes) -> None:
+        self._sock.sendall(self._encode_frame(opcode, payload))
+
+    @staticmethod
+    def _encode_frame(opcode: int, payload: bytes) -> bytes:
+        header = bytearray([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header.append(0x80 | length)
+        elif length < 1 << 16:
+            header.append(0x80 | 126)
+            header += length.to_bytes(2, "big")
+        else:
+            header.append(0x80 | 127)
+            header += length.to_bytes(8, "big")
+        mask = os.urandom(4)
+        header += mask
+        return bytes(header) + _apply_mask(payload, mask)
+
+    def _read_message(self) -> bytes:
+        fragments = []
+        while True:
+            first, second = self._read_exact(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = int.from_bytes(self._read_exact(2), "big")
+            elif length == 127:
+                length = int.from_bytes(self._read_exact(8), "big")
+            mask = self._read_exact(4) if second & 0x80 else None
+            payload = self._read_exact(length)
+            if mask is not None:
+                payload = _apply_mask(payload, mask)
+
+            if opcode == _OPCODE_CLOSE:
+                raise CDPError("DevTools closed the WebSocket connection")
+            if opcode == _OPCODE_PING:
+                self._write_frame(_OPCODE_PONG, payload)
+                continue
+            if opcode == _OPCODE_PONG:
+                continue
+            if opcode not in (_OPCODE_TEXT, _OPCODE_CONTINUATION):
+                raise CDPError(f"Unexpected WebSocket opcode {opcode:#x}")
+            fragments.append(payload)
+            if first & 0x80:
+                return b"".join(fragments)
+
+    def _read_exact(self, length: int) -> bytes:
+        data = self._reader.read(length)
+        if len(data) != length:
+            raise CDPError("DevTools WebSocket closed unexpectedly")
+        return data
+
+
+__all__ = ["CDPConnection", "CDPError"]
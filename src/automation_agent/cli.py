@@ -2,12 +2,14 @@
 from __future__ import annotations
 
 import argparse
+import codecs
 import json
 import sys
-from typing import Iterable
+from typing import Iterable, Iterator, List
 
+from . import _json
 from .action_executor import ActionExecutor
-from .browser_controller import BrowserController
+from .browser_controller import BrowserController, get_shared_controller
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -15,7 +17,8 @@ def build_parser() -> argparse.ArgumentParser:
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     run_parser = subparsers.add_parser("run", help="Execute a natural language request")
-    run_parser.add_argument("request", help="Natural language command to execute")
+    run_parser.add_argument("request", nargs="?", help="Natural language command to execute")
+    run_parser.add_argument("--batch-file", help="Execute every request in this file, one per line")
     run_parser.add_argument("--chrome-path", default="google-chrome", help="Path to the Chrome/Chromium executable")
     run_parser.add_argument("--port", type=int, default=9222, help="Remote debugging port")
     run_parser.add_argument("--headless", action="store_true", help="Launch the browser in headless mode")
@@ -23,17 +26,68 @@ def build_parser() -> argparse.ArgumentParser:
     run_parser.add_argument("--dry-run", action="store_true", help="Only output the action plan without executing it")
 
     plan_parser = subparsers.add_parser("plan", help="Print the generated plan for a request")
-    plan_parser.add_argument("request")
+    plan_parser.add_argument("request", nargs="?")
+    plan_parser.add_argument("--batch-file", help="Plan every request in this file, one per line")
 
     return parser
 
 
+def _encode_line(item: object) -> bytes:
+    if isinstance(item, (dict, list)):
+        return _json.dumps(item) + b"\n"
+    return f"{item}\n".encode("utf-8")
+
+
+def _format_line(item: object) -> str:
+    # Non-UTF-8 streams get \u escapes rather than a UnicodeEncodeError.
+    if isinstance(item, (dict, list)):
+        return json.dumps(item, separators=(",", ":")) + "\n"
+    return f"{item}\n"
+
+
 def _print_iterable(iterable: Iterable[object]) -> None:
+    """Writes one compact JSON line per item to stdout and flushes once at the end.
+
+    Lines go straight to the binary buffer behind ``sys.stdout`` when it is
+    UTF-8 encoded, so the text layer's per-line lock and flush are skipped.
+    Other streams receive ASCII-escaped JSON through the text layer.
+    """
+
+    stream = sys.stdout
+    buffer = getattr(stream, "buffer", None)
+    encoding = getattr(stream, "encoding", None)
+    if buffer is None or not encoding or codecs.lookup(encoding).name != "utf-8":
+        for item in iterable:
+            stream.write(_format_line(item))
+        stream.flush()
+        return
+    # Anything already written through the text layer must come out first.
+    stream.flush()
     for item in iterable:
-        if isinstance(item, (dict, list)):
-            print(json.dumps(item))
-        else:
-            print(item)
+        buffer.write(_encode_line(item))
+    buffer.flush()
+
+
+def _read_requests(parser: argparse.ArgumentParser, args: argparse.Namespace) -> List[str]:
+    if args.batch_file is None:
+        if args.request is None:
+            parser.error("a request or --batch-file is required")
+        return [args.request]
+    if args.request is not None:
+        parser.error("pass either a request or --batch-file, not both")
+    try:
+        with open(args.batch_file, encoding="utf-8") as handle:
+            requests = [line.strip() for line in handle if line.strip()]
+    except (OSError, UnicodeDecodeError) as exc:
+        parser.error(f"cannot read batch file: {exc}")
+    if not requests:
+        parser.error("batch file contains no requests")
+    return requests
+
+
+def _flatten(groups: Iterable[List[dict]]) -> Iterator[dict]:
+    for group in groups:
+        yield from group
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -41,19 +95,21 @@ def main(argv: list[str] | None = None) -> int:
     args = parser.parse_args(argv)
 
     if args.command == "plan":
-        controller = BrowserController()
-        executor = ActionExecutor(controller)
-        for action in executor.execute(args.request, dry_run=True):
-            print(json.dumps(action))
+        executor = ActionExecutor(BrowserController())
+        _print_iterable(_flatten(executor.execute_many(_read_requests(parser, args), dry_run=True)))
         return 0
 
     if args.command == "run":
-        controller = BrowserController(chrome_path=args.chrome_path, remote_debugging_port=args.port)
+        requests = _read_requests(parser, args)
+        controller = get_shared_controller(chrome_path=args.chrome_path, remote_debugging_port=args.port)
         executor = ActionExecutor(controller)
         if not args.no_launch:
             controller.launch_browser(headless=args.headless)
         try:
-            results = executor.stream_execution(args.request, dry_run=args.dry_run)
+            if len(requests) == 1:
+                results: Iterable[object] = executor.stream_execution(requests[0], dry_run=args.dry_run)
+            else:
+                results = _flatten(executor.execute_many(requests, dry_run=args.dry_run))
             _print_iterable(results)
         finally:
             if not args.no_launch and controller.is_browser_running():
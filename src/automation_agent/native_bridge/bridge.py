@@ -1,28 +1,40 @@
 """Optional helper utilities for interacting with native desktop applications."""
 from __future__ import annotations
 
-import os
 import shlex
 import subprocess
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .._compat import DATACLASS_SLOTS
+from .._process import resolve_executable
 
 
 class SecurityError(RuntimeError):
     """Raised when a disallowed operation is attempted."""
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class NativeBridge:
     """Executes whitelisted desktop commands.
 
     The bridge is intentionally strict: commands must be registered in advance
     together with the exact executable and argument template to prevent
     arbitrary command execution.
+
+    ``environment`` replaces the child environment when set; by default
+    commands inherit the current process environment without copying it.
+
+    Commands are started with ``close_fds=True`` by default so they cannot see
+    any descriptor this process has marked inheritable.  Setting
+    ``close_fds=False`` opts into CPython's faster ``posix_spawn`` path at
+    the cost of letting commands inherit such descriptors; only do so when no
+    inheritable descriptors are held that commands should not reach.
     """
 
     allowlist: Dict[str, List[str]] = field(default_factory=dict)
-    environment: Dict[str, str] = field(default_factory=lambda: dict(os.environ))
+    environment: Optional[Dict[str, str]] = None
+    close_fds: bool = True
 
     def register(self, name: str, command: Iterable[str]) -> None:
         self.allowlist[name] = list(command)
@@ -30,17 +42,76 @@ class NativeBridge:
     def is_allowed(self, name: str) -> bool:
         return name in self.allowlist
 
-    def run(self, name: str, extra_args: Iterable[str] | None = None) -> subprocess.CompletedProcess[str]:
+    def run(
+        self, name: str, extra_args: Iterable[str] | None = None, *, capture: bool = True
+    ) -> subprocess.CompletedProcess[str]:
+        """Runs an allowlisted command and waits for it to finish.
+
+        With ``capture=False`` the command's output is discarded instead of
+        being piped back and decoded.
+        """
+
+        args = resolve_executable(self._build_args(name, extra_args), self.environment)
+        if capture:
+            return subprocess.run(
+                args, env=self.environment, text=True, capture_output=True, check=True, close_fds=self.close_fds
+            )
+        return subprocess.run(
+            args,
+            env=self.environment,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+            close_fds=self.close_fds,
+        )
+
+    def run_many(
+        self, commands: Iterable[Tuple[str, Iterable[str] | None]], *, capture: bool = True
+    ) -> List[subprocess.CompletedProcess[str]]:
+        """Runs several allowlisted commands concurrently.
+
+        Every command is validated before anything is started, then all of them
+        are spawned before the first one is waited on.  Results are returned in
+        input order; :class:`subprocess.CalledProcessError` is raised for the
+        first failing command once all of them have finished.
+        """
+
+        argv_list = [
+            resolve_executable(self._build_args(name, extra_args), self.environment) for name, extra_args in commands
+        ]
+        streams = (
+            {"stdout": subprocess.PIPE, "stderr": subprocess.PIPE, "text": True}
+            if capture
+            else {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        )
+        processes: List[subprocess.Popen] = []
+        try:
+            for args in argv_list:
+                processes.append(subprocess.Popen(args, env=self.environment, close_fds=self.close_fds, **streams))
+        except BaseException:
+            # Do not leave already started commands running with open pipes.
+            for process in processes:
+                process.kill()
+                process.communicate()
+            raise
+        results = []
+        for args, process in zip(argv_list, processes):
+            stdout, stderr = process.communicate()
+            results.append(subprocess.CompletedProcess(args, process.returncode, stdout, stderr))
+        for result in results:
+            result.check_returncode()
+        return results
+
+    def _build_args(self, name: str, extra_args: Iterable[str] | None) -> List[str]:
         if not self.is_allowed(name):
             raise SecurityError(f"Command '{name}' is not allowlisted")
-        base_cmd = self.allowlist[name]
-        args = list(base_cmd)
+        args = list(self.allowlist[name])
         if extra_args:
             for arg in extra_args:
                 if arg.startswith("--unsafe"):
                     raise SecurityError("Arguments containing '--unsafe' are blocked")
                 args.append(arg)
-        return subprocess.run(args, env=self.environment, text=True, capture_output=True, check=True)
+        return args
 
     def describe(self) -> Dict[str, List[str]]:
         return {name: list(cmd) for name, cmd in self.allowlist.items()}
@@ -1,9 +1,23 @@
+import asyncio
+import gc
+import http.server
 import json
+import socket
+import subprocess
+import threading
+import time
+import weakref
 from typing import List
 
 import pytest
 
-from automation_agent.browser_controller import BrowserController
+from automation_agent.browser_controller import (
+    AsyncBrowserController,
+    BrowserController,
+    HTTPError,
+    _DefaultHTTPClient,
+    get_shared_controller,
+)
 
 
 class FakeProcess:
@@ -29,37 +43,76 @@ class FakeHTTPClient:
         self.requests.append(url)
         if url.endswith("/json/list"):
             return b"[]"
-        if "/json/new" in url:
-            return json.dumps({"id": "target-1"}).encode("utf-8")
-        if "/json/close" in url or "/json/activate" in url:
-            return json.dumps({"status": "ok"}).encode("utf-8")
+        if url.endswith("/json/version"):
+            return json.dumps({"webSocketDebuggerUrl": "ws://127.0.0.1:9333/devtools/browser/abc"}).encode("utf-8")
         raise AssertionError(f"Unexpected URL {url}")
 
 
+class FakeCDPConnection:
+    def __init__(self, url: str):
+        self.url = url
+        self.closed = False
+        self.commands: List[tuple] = []
+        self.batches: List[list] = []
+
+    def send(self, method, params=None):
+        return self.send_many([(method, params)])[0]
+
+    def send_many(self, commands):
+        self.batches.append(list(commands))
+        return [self._reply(method, params) for method, params in commands]
+
+    def _reply(self, method, params):
+        self.commands.append((method, params))
+        if method == "Target.createTarget":
+            return {"targetId": "target-1"}
+        if method == "Target.closeTarget":
+            return {"success": True}
+        if method == "Target.activateTarget":
+            return {}
+        raise AssertionError(f"Unexpected method {method}")
+
+    def close(self):
+        self.closed = True
+
+
+class FakeWebSocketFactory:
+    def __init__(self):
+        self.connections: List[FakeCDPConnection] = []
+
+    def __call__(self, url: str) -> FakeCDPConnection:
+        connection = FakeCDPConnection(url)
+        self.connections.append(connection)
+        return connection
+
+
 @pytest.fixture
-def controller():
-    http_client = FakeHTTPClient()
+def websockets():
+    return FakeWebSocketFactory()
+
+
+@pytest.fixture
+def controller(websockets, monkeypatch):
     process = FakeProcess()
-    controller = BrowserController(
+    monkeypatch.setattr(BrowserController, "_wait_until_ready", lambda self: None)
+    return BrowserController(
         chrome_path="/usr/bin/chrome",
         remote_debugging_port=9333,
-        http_client=http_client,
+        http_client=FakeHTTPClient(),
         process_factory=lambda args: process,
+        websocket_factory=websockets,
     )
-    controller._wait_until_ready = lambda: None  # type: ignore[attr-defined]
-    controller._fake_process = process  # type: ignore[attr-defined]
-    controller._fake_http_client = http_client  # type: ignore[attr-defined]
-    return controller
 
 
-def test_open_tab_uses_remote_debugging_endpoint(controller):
+def test_open_tab_uses_browser_websocket(controller, websockets):
     result = controller.open_tab("https://example.com")
-    assert result["id"] == "target-1"
-    expected_url = "http://127.0.0.1:9333/json/new?url=https%3A%2F%2Fexample.com"
-    assert controller._fake_http_client.requests[-1] == expected_url
+    assert result["targetId"] == "target-1"
+    connection = websockets.connections[-1]
+    assert connection.url == "ws://127.0.0.1:9333/devtools/browser/abc"
+    assert connection.commands[-1] == ("Target.createTarget", {"url": "https://example.com"})
 
 
-def test_perform_actions_invokes_individual_actions(controller):
+def test_perform_actions_invokes_individual_actions(controller, websockets):
     actions = [
         {"type": "open_url", "url": "https://example.com"},
         {"type": "activate", "target_id": "target-1"},
@@ -67,10 +120,174 @@ def test_perform_actions_invokes_individual_actions(controller):
     ]
     results = controller.perform_actions(actions)
     assert len(results) == 3
-    assert controller._fake_http_client.requests[-1].endswith("/json/close/target-1")
+    assert results == [{"targetId": "target-1"}, {}, {"success": True}]
+    connection = websockets.connections[0]
+    assert len(connection.batches) == 1
+    assert connection.commands[-1] == ("Target.closeTarget", {"targetId": "target-1"})
+
+
+def test_perform_actions_validates_before_sending(controller, websockets):
+    actions = [
+        {"type": "open_url", "url": "https://example.com"},
+        {"type": "close"},
+    ]
+    with pytest.raises(ValueError, match="target_id"):
+        controller.perform_actions(actions)
+    assert not websockets.connections
+
+
+def test_failed_websocket_is_closed_before_reconnecting(controller, websockets):
+    controller.open_tab("https://example.com")
+    stale = websockets.connections[0]
+    stale.closed = True
+    stale.close_calls = 0
+    stale.close = lambda: setattr(stale, "close_calls", stale.close_calls + 1)
+    controller.open_tab("https://example.com")
+    assert stale.close_calls == 1
+    assert len(websockets.connections) == 2
+
+
+def test_execute_action_rejects_unknown_types(controller):
+    with pytest.raises(ValueError, match="Unsupported action type: scroll"):
+        controller.execute_action({"type": "scroll"})
+    with pytest.raises(ValueError, match="open_url action requires a 'url'"):
+        controller.execute_action({"type": "open_url"})
+
+
+def test_terminate_browser_closes_websocket(controller, websockets):
+    controller.launch_browser()
+    controller.open_tab("https://example.com")
+    controller.terminate_browser()
+    assert websockets.connections[0].closed
+    controller.open_tab("https://example.com")
+    assert len(websockets.connections) == 2
+
+
+def test_terminate_browser_kills_hung_process(monkeypatch):
+    class HungProcess(FakeProcess):
+        def __init__(self):
+            super().__init__()
+            self.killed = False
+            self.timeouts: List[float] = []
+
+        def wait(self, timeout=None):
+            self.timeouts.append(timeout)
+            if not self.killed:
+                raise subprocess.TimeoutExpired("chrome", timeout)
+            return -9
+
+        def terminate(self):
+            pass
+
+        def kill(self):
+            self.killed = True
+            self.terminated = True
+
+    process = HungProcess()
+    monkeypatch.setattr(BrowserController, "_wait_until_ready", lambda self: None)
+    controller = BrowserController(http_client=FakeHTTPClient(), process_factory=lambda args: process)
+    controller.launch_browser()
+    controller.terminate_browser()
+
+    assert process.killed
+    assert process.timeouts == [0.5, 1]
+    assert not controller.is_browser_running()
+
+
+def test_wait_until_ready_backs_off_and_reuses_version(monkeypatch):
+    class FlakyHTTPClient(FakeHTTPClient):
+        failures = 1
+
+        def request(self, url, data=None, method="GET"):
+            if self.failures:
+                self.failures -= 1
+                self.requests.append(url)
+                raise HTTPError("empty reply from server")
+            return super().request(url, data=data, method=method)
 
+    delays: List[float] = []
+    probes = iter([False, False, False, True, True])
+    monkeypatch.setattr("automation_agent.browser_controller.time.sleep", delays.append)
+    monkeypatch.setattr(BrowserController, "_port_accepting", lambda self, timeout: next(probes))
+    http_client = FlakyHTTPClient()
+    controller = BrowserController(http_client=http_client, websocket_factory=FakeWebSocketFactory())
+    controller._wait_until_ready()
+    controller.open_tab("https://example.com")
 
-def test_launch_browser_invokes_process_factory():
+    assert delays == pytest.approx([0.01, 0.02, 0.04, 0.08])
+    assert http_client.requests == ["http://127.0.0.1:9222/json/version"] * 2
+
+
+def test_port_accepting_probes_tcp(devtools_server):
+    controller = BrowserController(remote_debugging_port=devtools_server.server_address[1])
+    assert controller._port_accepting()
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        port = unused.getsockname()[1]
+    assert not BrowserController(remote_debugging_port=port)._port_accepting()
+
+
+def test_probe_timeout_only_short_for_loopback_hosts(monkeypatch):
+    monkeypatch.setattr("automation_agent.browser_controller.time.monotonic", lambda: 100.0)
+    assert BrowserController(host="127.0.0.1")._probe_timeout(deadline=110.0) == 0.05
+    assert BrowserController(host="localhost")._probe_timeout(deadline=110.0) == 0.05
+    assert BrowserController(host="10.0.0.5")._probe_timeout(deadline=110.0) == 10.0
+    assert BrowserController(host="devtools.internal")._probe_timeout(deadline=100.0) == 0.05
+
+
+def test_http_client_is_created_lazily():
+    controller = BrowserController()
+    assert controller._http is None
+    assert isinstance(controller._http_client, _DefaultHTTPClient)
+    assert controller._http_client is controller._http
+
+
+def test_get_shared_controller_reuses_live_instances():
+    shared = get_shared_controller("/usr/bin/chrome", 9444)
+    assert get_shared_controller("/usr/bin/chrome", 9444) is shared
+    assert get_shared_controller("/usr/bin/chrome", 9445) is not shared
+
+    released = weakref.ref(shared)
+    del shared
+    gc.collect()
+    assert released() is None
+    assert get_shared_controller("/usr/bin/chrome", 9444).remote_debugging_port == 9444
+
+
+def test_shared_controller_is_kept_while_its_browser_runs(monkeypatch):
+    monkeypatch.setattr(BrowserController, "_wait_until_ready", lambda self: None)
+    shared = get_shared_controller("/usr/bin/chrome", 9446)
+    shared._process_factory = lambda args: FakeProcess()
+    shared.launch_browser()
+    released = weakref.ref(shared)
+    del shared
+    gc.collect()
+    assert released() is get_shared_controller("/usr/bin/chrome", 9446)
+
+    released().terminate_browser()
+    gc.collect()
+    assert released() is None
+
+
+def test_concurrent_launch_starts_one_browser(monkeypatch):
+    calls = []
+
+    def process_factory(args):
+        calls.append(args)
+        time.sleep(0.05)
+        return FakeProcess()
+
+    monkeypatch.setattr(BrowserController, "_wait_until_ready", lambda self: None)
+    controller = BrowserController(http_client=FakeHTTPClient(), process_factory=process_factory)
+    threads = [threading.Thread(target=controller.launch_browser) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+
+
+def test_launch_browser_invokes_process_factory(monkeypatch):
     http_client = FakeHTTPClient()
     process = FakeProcess()
     calls = []
@@ -86,9 +303,64 @@ def test_launch_browser_invokes_process_factory():
         process_factory=process_factory,
     )
 
-    controller._wait_until_ready = lambda: None  # type: ignore[attr-defined]
+    monkeypatch.setattr(BrowserController, "_wait_until_ready", lambda self: None)
     controller.launch_browser(headless=True)
 
     assert calls
     assert calls[0][0] == "/usr/bin/chrome"
     assert any(arg.startswith("--remote-debugging-port=9333") for arg in calls[0])
+
+
+def test_async_perform_actions_returns_sync_batch_results(controller, websockets):
+    actions = [
+        {"type": "open_url", "url": "https://example.com"},
+        {"type": "activate", "target_id": "target-1"},
+        {"type": "open_url", "url": "https://example.org"},
+        {"type": "close", "target_id": "target-1"},
+    ]
+    results = asyncio.run(AsyncBrowserController(controller).perform_actions(actions))
+    assert results == [{"targetId": "target-1"}, {}, {"targetId": "target-1"}, {"success": True}]
+    assert len(websockets.connections[0].batches) == 1
+
+
+@pytest.fixture
+def devtools_server():
+    peers: List[tuple] = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            peers.append(self.client_address)
+            status = 404 if self.path == "/missing" else 200
+            body = b"[]"
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.peers = peers  # type: ignore[attr-defined]
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_default_http_client_reuses_connection(devtools_server):
+    client = _DefaultHTTPClient()
+    base = f"http://127.0.0.1:{devtools_server.server_address[1]}"
+    try:
+        assert client.request(f"{base}/json/list") == b"[]"
+        assert client.request(f"{base}/json/list") == b"[]"
+        with pytest.raises(HTTPError):
+            client.request(f"{base}/missing")
+    finally:
+        client.close()
+    assert len(devtools_server.peers) == 3
+    assert len(set(devtools_server.peers)) == 1
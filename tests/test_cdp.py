@@ -0,0 +1,164 @@
+import base64
+import hashlib
+import json
+import socket
+import threading
+
+import pytest
+
+from automation_agent.cdp import CDPConnection, CDPError, _apply_mask
+
+
+def _read_exact(conn, length):
+    data = b""
+    while len(data) < length:
+        chunk = conn.recv(length - len(data))
+        if not chunk:
+            raise EOFError
+        data += chunk
+    return data
+
+
+def _read_frame(conn):
+    first, second = _read_exact(conn, 2)
+    length = second & 0x7F
+    if length == 126:
+        length = int.from_bytes(_read_exact(conn, 2), "big")
+    elif length == 127:
+        length = int.from_bytes(_read_exact(conn, 8), "big")
+    mask = _read_exact(conn, 4)
+    return first & 0x0F, _apply_mask(_read_exact(conn, length), mask)
+
+
+def _write_frame(conn, payload, opcode=0x1):
+    header = bytes([0x80 | opcode])
+    if len(payload) < 126:
+        header += bytes([len(payload)])
+    else:
+        header += bytes([126]) + len(payload).to_bytes(2, "big")
+    conn.sendall(header + payload)
+
+
+@pytest.fixture
+def websocket_server():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    received = []
+    pending = []
+
+    def serve():
+        conn, _ = listener.accept()
+        with conn:
+            request = b""
+            while not request.endswith(b"\r\n\r\n"):
+                request += conn.recv(1)
+            key = next(
+                line.split(b":", 1)[1].strip()
+                for line in request.split(b"\r\n")
+                if line.lower().startswith(b"sec-websocket-key")
+            )
+            accept = base64.b64encode(hashlib.sha1(key + b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11").digest())
+            conn.sendall(
+                b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+            )
+            while True:
+                try:
+                    opcode, payload = _read_frame(conn)
+                except EOFError:
+                    return
+                if opcode == 0x8:
+                    return
+                if opcode == 0xA:
+                    received.append("pong")
+                    continue
+                message = json.loads(payload)
+                if message["method"] == "Test.disconnect":
+                    return
+                received.append(message)
+                if message["method"] == "Target.closeTarget":
+                    pending.append({"id": message["id"], "error": {"message": "No target with given id found"}})
+                else:
+                    pending.append({"id": message["id"], "result": {"echo": message["params"]}})
+                if message["params"].get("defer"):
+                    continue
+                _write_frame(conn, b"", opcode=0x9)
+                _write_frame(conn, json.dumps({"method": "Target.targetCreated", "params": {}}).encode())
+                for reply in reversed(pending):
+                    _write_frame(conn, json.dumps(reply).encode())
+                pending.clear()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield f"ws://127.0.0.1:{listener.getsockname()[1]}/devtools/browser/abc", received
+    thread.join(timeout=2)
+    listener.close()
+
+
+def test_cdp_connection_round_trips_commands(websocket_server):
+    url, received = websocket_server
+    connection = CDPConnection(url)
+    try:
+        long_url = "https://example.com/" + "a" * 300
+        assert connection.send("Target.createTarget", {"url": long_url}) == {"echo": {"url": long_url}}
+        with pytest.raises(CDPError, match="No target"):
+            connection.send("Target.closeTarget", {"targetId": "missing"})
+    finally:
+        connection.close()
+    assert [message["id"] for message in received if message != "pong"] == [1, 2]
+    assert "pong" in received
+    assert connection.closed
+
+
+def test_cdp_connection_pipelines_batches(websocket_server):
+    url, received = websocket_server
+    connection = CDPConnection(url)
+    try:
+        results = connection.send_many(
+            [
+                ("Target.createTarget", {"url": "https://a.example", "defer": True}),
+                ("Target.createTarget", {"url": "https://b.example", "defer": True}),
+                ("Target.createTarget", {"url": "https://c.example"}),
+            ]
+        )
+    finally:
+        connection.close()
+    assert [result["echo"]["url"] for result in results] == [
+        "https://a.example",
+        "https://b.example",
+        "https://c.example",
+    ]
+    assert [message["id"] for message in received if message != "pong"] == [1, 2, 3]
+
+
+def test_cdp_connection_releases_socket_after_transport_failure(websocket_server):
+    url, _ = websocket_server
+    connection = CDPConnection(url)
+    with pytest.raises(CDPError, match="Test.disconnect"):
+        connection.send("Test.disconnect")
+    assert connection.closed
+    assert connection._sock.fileno() == -1
+    connection.close()
+
+
+def test_cdp_connection_reports_every_outcome_of_a_failed_batch(websocket_server):
+    url, received = websocket_server
+    connection = CDPConnection(url)
+    try:
+        with pytest.raises(CDPError, match="Target.closeTarget failed: No target") as excinfo:
+            connection.send_many(
+                [
+                    ("Target.createTarget", {"url": "https://a.example", "defer": True}),
+                    ("Target.closeTarget", {"targetId": "missing", "defer": True}),
+                    ("Target.createTarget", {"url": "https://b.example"}),
+                ]
+            )
+    finally:
+        connection.close()
+    assert [message["id"] for message in received if message != "pong"] == [1, 2, 3]
+    results = excinfo.value.results
+    assert results[0] == {"echo": {"url": "https://a.example", "defer": True}}
+    assert results[1] is None
+    assert results[2] == {"echo": {"url": "https://b.example"}}
+    assert excinfo.value.errors == {1: {"message": "No target with given id found"}}
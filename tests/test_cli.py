@@ -0,0 +1,47 @@
+import io
+import json
+import sys
+
+import pytest
+
+from automation_agent.cli import main
+
+
+def test_plan_command_prints_json_lines(capsys):
+    assert main(["plan", "search for calendar shortcuts"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"type": "open_url", "url": "https://www.google.com/search?q=calendar+shortcuts"}
+    ]
+
+
+def test_plan_command_reads_batch_file(tmp_path, capsys):
+    batch = tmp_path / "requests.txt"
+    batch.write_text("open https://example.com\n\nopen https://example.org\n", encoding="utf-8")
+    assert main(["plan", "--batch-file", str(batch)]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["url"] for line in lines] == ["https://example.com", "https://example.org"]
+
+
+def test_plan_command_escapes_non_ascii_for_non_utf8_stdout(monkeypatch):
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="ascii")
+    monkeypatch.setattr(sys, "stdout", stdout)
+    assert main(["plan", "open https://café.example"]) == 0
+    output = stdout.buffer.getvalue()
+    assert output == b'{"type":"open_url","url":"https://caf\\u00e9.example"}\n'
+
+
+def test_empty_batch_file_is_rejected(tmp_path, capsys):
+    batch = tmp_path / "requests.txt"
+    batch.write_text("\n  \n", encoding="utf-8")
+    with pytest.raises(SystemExit) as excinfo:
+        main(["run", "--batch-file", str(batch), "--no-launch"])
+    assert excinfo.value.code == 2
+    assert "batch file contains no requests" in capsys.readouterr().err
+
+
+def test_unreadable_batch_file_is_reported(tmp_path, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        main(["plan", "--batch-file", str(tmp_path / "missing.txt")])
+    assert excinfo.value.code == 2
+    assert "cannot read batch file" in capsys.readouterr().err
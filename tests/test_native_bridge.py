@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from automation_agent.native_bridge.bridge import NativeBridge, SecurityError
+
+
+@pytest.fixture
+def bridge():
+    bridge = NativeBridge()
+    bridge.register("echo", [sys.executable, "-c", "import sys; print(' '.join(sys.argv[1:]))"])
+    bridge.register("fail", [sys.executable, "-c", "raise SystemExit(3)"])
+    return bridge
+
+
+def test_run_captures_output(bridge):
+    assert bridge.run("echo", ["hello"]).stdout == "hello\n"
+    assert bridge.run("echo", ["hello"], capture=False).stdout is None
+
+
+def test_run_rejects_unlisted_and_unsafe_commands(bridge):
+    with pytest.raises(SecurityError):
+        bridge.run("rm")
+    with pytest.raises(SecurityError):
+        bridge.run("echo", ["--unsafe-mode"])
+
+
+def test_run_many_returns_results_in_order(bridge):
+    results = bridge.run_many([("echo", ["a"]), ("echo", ["b"])])
+    assert [result.stdout for result in results] == ["a\n", "b\n"]
+
+
+def test_run_many_validates_before_spawning_and_reports_failures(bridge):
+    with pytest.raises(SecurityError):
+        bridge.run_many([("echo", ["a"]), ("rm", None)])
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        bridge.run_many([("echo", ["a"]), ("fail", None)], capture=False)
+    assert excinfo.value.returncode == 3
+
+
+def test_run_resolves_bare_executable_names():
+    bridge = NativeBridge()
+    bridge.register("python", [Path(sys.executable).name, "-c", "print('ok')"])
+    bridge.environment = {"PATH": str(Path(sys.executable).parent)}
+    result = bridge.run("python")
+    assert result.stdout == "ok\n"
+    assert result.args[0] == str(Path(sys.executable).parent / Path(sys.executable).name)
+
+
+def test_run_many_reaps_started_processes_when_a_spawn_fails(bridge, monkeypatch):
+    started = []
+
+    class RecordingPopen(subprocess.Popen):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            started.append(self)
+
+    monkeypatch.setattr(subprocess, "Popen", RecordingPopen)
+    bridge.register("sleep", [sys.executable, "-c", "import time; time.sleep(30)"])
+    bridge.register("missing", ["/nonexistent/automation-agent-binary"])
+    with pytest.raises(FileNotFoundError):
+        bridge.run_many([("sleep", None), ("missing", None)])
+    assert len(started) == 1
+    assert started[0].returncode is not None
+    assert started[0].stdout.closed and started[0].stderr.closed
+
+
+def test_close_fds_is_on_unless_explicitly_disabled():
+    read_fd, write_fd = os.pipe()
+    os.set_inheritable(write_fd, True)
+    try:
+        bridge = NativeBridge()
+        bridge.register("probe", [sys.executable, "-c", f"import os; os.fstat({write_fd}); print('inherited')"])
+        with pytest.raises(subprocess.CalledProcessError):
+            bridge.run("probe")
+        bridge.close_fds = False
+        assert bridge.run("probe").stdout == "inherited\n"
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
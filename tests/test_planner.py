@@ -1,3 +1,6 @@
+import gc
+import weakref
+
 from automation_agent.action_executor import ActionExecutor, RuleBasedPlanner
 
 
@@ -5,6 +8,10 @@ class DummyController:
     def __init__(self):
         self.actions = []
 
+    def execute_action(self, action):
+        self.actions.append(action)
+        return {"result": "ok"}
+
     def perform_actions(self, actions):
         self.actions.extend(actions)
         return [{"result": "ok"} for _ in actions]
@@ -16,6 +23,52 @@ def test_rule_based_planner_open_url():
     assert actions == [{"type": "open_url", "url": "https://example.com"}]
 
 
+def test_rule_based_planner_search_is_case_insensitive_and_encoded():
+    planner = RuleBasedPlanner()
+    actions = planner.plan("Please Search For  café & tea ")
+    assert actions == [{"type": "open_url", "url": "https://www.google.com/search?q=caf%C3%A9+%26+tea"}]
+
+
+def test_rule_based_planner_open_without_scheme_searches():
+    planner = RuleBasedPlanner()
+    assert planner.plan("Open example site") == [
+        {"type": "open_url", "url": "https://www.google.com/search?q=example+site"}
+    ]
+
+
+def test_rule_based_planner_custom_search_templates():
+    assert RuleBasedPlanner("https://duckduckgo.com/?q={query}&ia=web").plan("a b") == [
+        {"type": "open_url", "url": "https://duckduckgo.com/?q=a+b&ia=web"}
+    ]
+    assert RuleBasedPlanner("https://example.com/{{raw}}?q={query}").plan("a b") == [
+        {"type": "open_url", "url": "https://example.com/{raw}?q=a+b"}
+    ]
+
+
+def test_rule_based_planner_handles_long_whitespace_runs():
+    planner = RuleBasedPlanner("{query}")
+    spaces = " " * 50_000
+    plus = "+" * 50_000
+    assert planner.plan("open a" + spaces + "b" + spaces) == [{"type": "open_url", "url": "a" + plus + "b"}]
+    assert planner.plan(spaces + "hello" + spaces) == [{"type": "open_url", "url": plus + "hello" + plus}]
+
+
+def test_rule_based_planner_returns_independent_copies_of_cached_plans():
+    planner = RuleBasedPlanner()
+    first = planner.plan("open https://example.com")
+    first[0]["url"] = "mutated"
+    assert planner.plan("open https://example.com") == [{"type": "open_url", "url": "https://example.com"}]
+
+
+def test_plan_cache_does_not_keep_planners_alive():
+    planner = RuleBasedPlanner("https://search.example/?q={query}")
+    planner.plan("cache me")
+    released = weakref.ref(planner)
+    del planner
+    gc.collect()
+    assert released() is None
+
+
 def test_action_executor_dry_run_returns_plan():
     controller = DummyController()
     executor = ActionExecutor(controller)
@@ -30,3 +83,27 @@ def test_action_executor_executes_actions():
     result = executor.execute("open https://example.com", dry_run=False)
     assert controller.actions[0]["url"] == "https://example.com"
     assert result == [{"result": "ok"}]
+
+
+def test_stream_execution_dry_run_yields_plan_without_executing():
+    controller = DummyController()
+    executor = ActionExecutor(controller)
+    assert list(executor.stream_execution("open https://example.com", dry_run=True)) == [
+        {"type": "open_url", "url": "https://example.com"}
+    ]
+    assert controller.actions == []
+    assert list(executor.stream_execution("open https://example.com")) == [{"result": "ok"}]
+
+
+def test_plan_many_matches_individual_plans():
+    planner = RuleBasedPlanner()
+    requests = ["open https://example.com", "search for testing shortcuts", "hello"]
+    assert planner.plan_many(requests) == [planner.plan(request) for request in requests]
+
+
+def test_execute_many_sends_one_batch_and_groups_results():
+    controller = DummyController()
+    executor = ActionExecutor(controller)
+    results = executor.execute_many(["open https://example.com", "open https://example.org"])
+    assert [action["url"] for action in controller.actions] == ["https://example.com", "https://example.org"]
+    assert results == [[{"result": "ok"}], [{"result": "ok"}]]